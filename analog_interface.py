@@ -1,14 +1,38 @@
+import os
+import re
+import numpy as np
 import pandas as pd
-from collections import defaultdict
 import sys
 
+# 输入表格的列名及类型，显式指定类型可跳过 pandas 的类型推断
+_COLUMNS = ["PortName", "Direction", "Type", "FromTo"]
+_COLUMN_DTYPES = {name: "string" for name in _COLUMNS}
+
+# FromTo 到端口方向的映射
+_DIRECTION_MAP = {"CA": "output", "AC": "input", "RA": "output", "AR": "input"}
+
+# 端口名与位宽，如 "data<7:0>" -> base="data", hi=7, lo=0
+_BIT_RE = re.compile(r'^(?P<base>[^<]+)(?:<(?P<hi>\d+)(?::(?P<lo>\d+))?>)?$')
+
 
 def read_excel_data(input_file):
     """
     从 Excel 文件中读取数据并返回 DataFrame
     跳过标题行，从第 2 行开始读取。
+    .csv 文件直接用 read_csv 读取，其余文件以 openpyxl 只读模式读取。
     """
-    df = pd.read_excel(input_file, skiprows=1, header=None, names=["PortName", "Direction", "Type", "FromTo"])
+    if os.path.splitext(input_file)[1].lower() == ".csv":
+        return pd.read_csv(input_file, skiprows=1, header=None, names=_COLUMNS, dtype=_COLUMN_DTYPES)
+
+    df = pd.read_excel(
+        input_file,
+        skiprows=1,
+        header=None,
+        names=_COLUMNS,
+        dtype=_COLUMN_DTYPES,
+        engine="openpyxl",
+        engine_kwargs={"read_only": True, "data_only": True},
+    )
     return df
 
 
@@ -16,50 +40,54 @@ def process_data(df):
     """
     根据规则处理数据，生成 Verilog 的端口定义，同时统计生成的端口信息
     """
-    # 定义方向映射
-    direction_map = {"CA": "output", "AC": "input", "RA": "output", "AR": "input"}
-
     # 过滤掉 "pad" 类型的行
-    ungenerated_ports = df[df["Type"] == "pad"]  # 未生成的端口记录
-    df = df[df["Type"] != "pad"]
-
-    # 存储处理后的信号
-    ports = defaultdict(list)
+    is_pad = df["Type"].eq("pad").fillna(False)  # Type 为空的行不算 pad
+    ungenerated_ports = df[is_pad]  # 未生成的端口记录
+    df = df[~is_pad]
 
     # 统计生成的端口数
     stats = {"input": 0, "output": 0}
 
-    # 处理每一行数据
-    for _, row in df.iterrows():
-        port_name = row["PortName"]
-        direction = direction_map.get(row["FromTo"], "input")  # 默认方向为 input
-        if "<" in port_name:
-            # 提取位宽信息并标准化
-            base_name, range_part = port_name.split("<")
-            range_part = range_part.strip(">")
-            if ":" in range_part:
-                start, end = map(int, range_part.split(":"))
-            else:
-                start = end = int(range_part)
-            ports[(base_name, direction)].append((start, end))
-        else:
-            # 无位宽信息
-            ports[(port_name, direction)].append(None)
-
-    # 合并位宽并统计
-    verilog_ports = []
-    for (base_name, direction), ranges in ports.items():
-        if all(r is None for r in ranges):
-            # 无位宽信息
-            verilog_ports.append(f"{direction} {base_name}")
-        else:
-            # 合并位宽
-            min_bit = min(r[1] for r in ranges if r is not None)
-            max_bit = max(r[0] for r in ranges if r is not None)
-            verilog_ports.append(f"{direction} [{max_bit}:{min_bit}] {base_name}")
-
-        # 更新统计
-        stats[direction] += 1
+    # 常见情况：所有端口都没有位宽，直接去重即可，无需解析位宽
+    if not df["PortName"].str.contains("<", regex=False, na=False).any():
+        ports = pd.DataFrame({
+            "direction": df["FromTo"].map(_DIRECTION_MAP).fillna("input"),  # 默认方向为 input
+            "base": df["PortName"],
+        }).dropna().drop_duplicates()
+        verilog_ports = (ports["direction"] + " " + ports["base"]).tolist()
+        stats.update(ports["direction"].value_counts().to_dict())
+        return verilog_ports, stats, ungenerated_ports
+
+    # 拆分端口名与位宽
+    parts = df["PortName"].str.extract(_BIT_RE)
+    parts["base"] = parts["base"].fillna(df["PortName"])
+    parts["direction"] = df["FromTo"].map(_DIRECTION_MAP).fillna("input")  # 默认方向为 input
+
+    # 单 bit 时 lo = hi，无位宽时两者均为空（NaN）
+    parts = parts[parts["base"].notna()]
+    hi = parts["hi"].astype("float64").to_numpy()
+    lo = parts["lo"].astype("float64").to_numpy()
+    lo = np.where(np.isnan(lo), hi, lo)
+
+    # 合并位宽：按 (base, direction) 编号（保持首次出现的顺序），排序后每个端口的
+    # 位宽是连续的一段，用 reduceat 一次求出每段的最高位和最低位（fmax/fmin 忽略 NaN）
+    codes, keys = pd.MultiIndex.from_arrays([parts["base"], parts["direction"]]).factorize()
+    order = np.argsort(codes, kind="stable")
+    offsets = np.flatnonzero(np.diff(codes[order], prepend=-1))
+    grouped = pd.DataFrame({
+        "base": keys.get_level_values(0),
+        "direction": keys.get_level_values(1),
+        "hi": pd.Series(np.fmax.reduceat(hi[order], offsets)).astype("Int64"),
+        "lo": pd.Series(np.fmin.reduceat(lo[order], offsets)).astype("Int64"),
+    })
+
+    scalar_ports = grouped["direction"] + " " + grouped["base"]
+    ranged_ports = (grouped["direction"] + " [" + grouped["hi"].astype(str) + ":"
+                    + grouped["lo"].astype(str) + "] " + grouped["base"])
+    verilog_ports = scalar_ports.where(grouped["hi"].isna(), ranged_ports).tolist()
+
+    # 更新统计
+    stats.update(grouped["direction"].value_counts().to_dict())
 
     return verilog_ports, stats, ungenerated_ports
 
@@ -68,13 +96,15 @@ def generate_verilog_file(verilog_ports, output_file):
     """
     根据处理后的端口定义，生成 Verilog 文件
     """
-    verilog_code = "module generated_ports (\n"
-    verilog_code += "    " + ",\n    ".join(verilog_ports) + "\n"
-    verilog_code += ");\n\nendmodule"
-
-    # 写入 Verilog 文件
-    with open(output_file, "w") as f:
-        f.write(verilog_code)
+    # 逐个端口写入 Verilog 文件，不拼接完整的中间字符串
+    with open(output_file, "w", buffering=1 << 20) as f:
+        f.write("module generated_ports (\n    ")
+        separator = ""
+        for port in verilog_ports:
+            f.write(separator)
+            f.write(port)
+            separator = ",\n    "
+        f.write("\n);\n\nendmodule")
     print(f"Verilog file generated: {output_file}")
 
 
@@ -1,78 +1,297 @@
+import argparse
+import contextlib
+import functools
+import io
+import multiprocessing
+import os
 import re
 import sys
-
-
-def find_ports(file_content):
-    """Find all input/output ports declared in the module."""
-    ports = re.findall(r'\b(input|output)\b\s+(?:\[.*?\]\s+)?(\w+)', file_content)
-    return {port for _, port in ports}
-
-
-def find_logic_usage(file_content):
-    """Find all variables used in logical operations."""
-    usage = re.findall(r'\b(\w+)\b\s*(?:=|<=|==|!=|&|\||\^|~|\+|-|\*|/|%)', file_content)
-    return set(usage)
-
-
-def check_port_usage(file_content):
+from collections import Counter
+from typing import NamedTuple
+from dataclasses import dataclass, field
+
+
+# The leading lookahead rejects whitespace and other untokenized characters
+# before any alternative is tried; identifiers come first as the most common
+# token, and keywords are split out of them with a set lookup afterwards.
+# Line comments and string literals are matched as 'co' and skipped; a string
+# missing its closing quote stops at the end of its line. Block comments
+# ('bc') and ranges that do not close on their own line ('open') are only
+# opened here; the scanner finds their end with str.find.
+_MASTER = re.compile(
+    r'(?=[\w/\[\'"();&|^~+\-*%=<!])(?:'
+    r'(?P<id>[A-Za-z_]\w*)'
+    r'|(?P<co>//[^\n]*|"(?:\\.|[^"\\\n])*"?)'
+    r'|(?P<bc>/\*)'
+    r'|(?P<num>\d*\'[sS]?[bodhBODH]\w+|\d\w*)'
+    r'|(?P<lb>\[[^\]\n]*\])'
+    r'|(?P<open>\[)'
+    r'|(?P<op><=|==|!=|[&|^~+\-*/%=])'
+    r'|(?P<sc>;)'
+    r'|(?P<pr>[()]))',
+)
+_KEYWORDS = frozenset(
+    ['module', 'endmodule', 'input', 'output', 'reg', 'always', 'begin', 'end', 'posedge', 'negedge'])
+_STRIP_COMMENTS = re.compile(r'//[^\n]*|/\*.*?\*/|"(?:\\.|[^"\\\n])*"?', re.DOTALL)
+_NONBLOCK_RE = re.compile(r'^([^\n]*?<=[^\n]*)$', re.M)
+_BLOCK_RE = re.compile(r'^(?![^\n]*<=)([^\n]*?(?<![=!<>])=(?!=)[^\n]*)$', re.M)
+_WORD_BE = re.compile(r'\b(begin|end)\b')
+_NET_TYPES = {'wire', 'signed', 'logic'}
+
+_CHUNK_SIZE = 65536
+# Longer than any token the scanner has to look past a chunk boundary for
+_OVERLAP = 256
+
+# always-block parser states
+_IDLE, _HEADER, _BODY_START, _BODY_BEGIN, _BODY_STMT = range(5)
+
+
+class AlwaysBlock(NamedTuple):
+    """An always block's code and the variables assigned in it.
+
+    Only names not yet declared as reg when the block closes are kept, as a
+    plain tuple, so blocks that only assign declared regs share the empty tuple.
+    """
+    text: str
+    assigned: tuple
+
+
+@dataclass
+class VerilogScan:
+    """Everything the checks need, collected in a single pass over the source."""
+    module_count: int = 0
+    endmodule_count: int = 0
+    ports: set = field(default_factory=set)
+    declared_regs: frozenset = frozenset()
+    logic_usage: set = field(default_factory=set)
+    comb_blocks: list = field(default_factory=list)
+    seq_blocks: list = field(default_factory=list)
+
+
+def read_chunks(file, size=_CHUNK_SIZE):
+    """Yield the file's text in fixed-size chunks."""
+    while True:
+        chunk = file.read(size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def scan_verilog(source):
+    """Tokenize the source once and collect ports, regs, logic usage and always blocks.
+
+    `source` is either the whole text or an iterable of text chunks. Chunks
+    are scanned as they arrive; only a short tail (plus the body of an
+    always block that is still open) is carried over to the next chunk, so
+    tokens split across a chunk boundary are rescanned once they are whole.
+    """
+    if isinstance(source, str):
+        source = [source]
+    scan = VerilogScan()
+    declared_regs = set()
+    want_port = want_reg = False
+    last_id = None
+    last_end = 0
+
+    state = _IDLE
+    kind = None
+    paren = depth = block_start = 0
+    block_parts = []
+    closer = None  # '*/' or ']' while inside a block comment or multi-line range
+    block_assigned = set()
+
+    chunks = iter(source)
+    tail = ''
+    chunk = next(chunks, None)
+    while chunk is not None:
+        chunk_next = next(chunks, None)
+        final = chunk_next is None
+        buf = tail + chunk
+        limit = len(buf) if final else len(buf) - _OVERLAP
+        pos = 0
+
+        while True:
+            if closer:
+                close = buf.find(closer, pos)
+                if close == -1:
+                    # Keep the last character in case '*/' straddles the boundary
+                    pos = len(buf) if final else max(pos, len(buf) - len(closer) + 1)
+                    break
+                pos = close + len(closer)
+                closer = None
+                last_id = None
+
+            # Restarted after each comment or range that str.find skips over;
+            # a skipped range leaves want_port/want_reg set, like 'lb'
+            for m in _MASTER.finditer(buf, pos):
+                if m.end() > limit:
+                    break
+                group = m.lastgroup
+                if group == 'bc' or group == 'open':
+                    pos = m.end()
+                    closer = '*/' if group == 'bc' else ']'
+                    break
+                pos = m.end()
+                if group == 'co':
+                    last_id = None
+                    continue
+                token = m.group()
+                if group == 'id':
+                    # Repeated names share one interned object, so set lookups hit on identity
+                    token = sys.intern(token)
+                    if token in _KEYWORDS:
+                        group = 'kw'
+
+                # Declarations, module counts and logic usage
+                if group == 'id':
+                    if token not in _NET_TYPES:
+                        if want_port:
+                            scan.ports.add(token)
+                        if want_reg:
+                            declared_regs.add(token)
+                        want_port = want_reg = False
+                elif group == 'kw':
+                    if token == 'input' or token == 'output':
+                        want_port = True
+                    elif token == 'reg':
+                        want_reg = True
+                    else:
+                        want_port = want_reg = False
+                        if token == 'module':
+                            scan.module_count += 1
+                        elif token == 'endmodule':
+                            scan.endmodule_count += 1
+                elif group != 'lb':
+                    want_port = want_reg = False
+                    if group == 'op' and last_id is not None and not buf[last_end:m.start()].strip():
+                        scan.logic_usage.add(last_id)
+                        if state in (_BODY_BEGIN, _BODY_STMT) and (token == '=' or token == '<='):
+                            block_assigned.add(last_id)
+                if group == 'id':
+                    last_id, last_end = token, m.end()
+                else:
+                    last_id = None
+
+                # always @(...) blocks
+                if state == _IDLE:
+                    if token == 'always' and group == 'kw':
+                        state, kind, paren = _HEADER, None, 0
+                        block_assigned.clear()
+                elif state == _HEADER:
+                    if token == '(':
+                        paren += 1
+                    elif token == ')':
+                        paren -= 1
+                        if paren == 0:
+                            state = _BODY_START
+                    elif token == '*' and kind is None:
+                        kind = 'comb'
+                        if paren == 0:  # always @*
+                            state = _BODY_START
+                    elif token in ('posedge', 'negedge') and kind is None:
+                        kind = 'seq'
+                elif state == _BODY_START:
+                    block_start = m.start()
+                    if token == 'begin' and group == 'kw':
+                        state, depth = _BODY_BEGIN, 1
+                    elif group == 'sc':
+                        _close_block(scan, kind, buf[block_start:pos], block_assigned, declared_regs)
+                        state = _IDLE
+                    else:
+                        state = _BODY_STMT
+                elif state == _BODY_BEGIN:
+                    if group == 'kw' and token in ('begin', 'end'):
+                        depth += 1 if token == 'begin' else -1
+                        if depth == 0:
+                            block_parts.append(buf[block_start:pos])
+                            _close_block(scan, kind, ''.join(block_parts), block_assigned, declared_regs)
+                            block_parts.clear()
+                            state = _IDLE
+                elif state == _BODY_STMT and group == 'sc':
+                    block_parts.append(buf[block_start:pos])
+                    _close_block(scan, kind, ''.join(block_parts), block_assigned, declared_regs)
+                    block_parts.clear()
+                    state = _IDLE
+
+            if not closer:
+                break
+
+        # Carry the unconsumed tail, and the open block's text so far, over
+        if state in (_BODY_BEGIN, _BODY_STMT):
+            block_parts.append(buf[block_start:pos])
+            block_start = 0
+        last_end -= pos
+        tail = buf[pos:]
+        chunk = chunk_next
+
+    if state in (_BODY_BEGIN, _BODY_STMT):
+        # Unterminated block: keep what is there so the begin/end check reports it
+        block_parts.append(tail)
+        _close_block(scan, kind, ''.join(block_parts), block_assigned, declared_regs)
+    scan.declared_regs = frozenset(declared_regs)
+    return scan
+
+
+@functools.lru_cache(maxsize=8)
+def _scan_file(path, mtime_ns, size):
+    """Scan a file, reusing the result while its path, mtime and size are unchanged.
+
+    Each entry holds a full VerilogScan, including the text of every always
+    block, so only callers that re-check the same file should go through it.
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        return scan_verilog(read_chunks(file))
+
+
+def _blank_out(match):
+    """Replace a comment or string with blank text, keeping its line breaks."""
+    return '\n' * match.group().count('\n') or ' '
+
+
+def _close_block(scan, kind, text, assigned, declared_regs):
+    """Record a finished always block under its kind; other sensitivity lists are skipped.
+
+    Comments and strings are blanked out so the per-block checks only see code.
+    """
+    pending = tuple(name for name in assigned if name not in declared_regs)
+    block = AlwaysBlock(_STRIP_COMMENTS.sub(_blank_out, text), pending)
+    if kind == 'comb':
+        scan.comb_blocks.append(block)
+    elif kind == 'seq':
+        scan.seq_blocks.append(block)
+
+
+def check_port_usage(scan):
     """Check if all ports are logically used."""
-    ports = find_ports(file_content)
-    logic_usage = find_logic_usage(file_content)
-
-    unused_ports = ports - logic_usage
+    unused_ports = scan.ports - scan.logic_usage
     if unused_ports:
         print(f"Warning: The following ports are declared but not used in logic: {unused_ports}")
 
 
-def find_blocks(file_content, pattern):
-    """Find all blocks matching a specific pattern."""
-    return re.findall(pattern, file_content, re.DOTALL)
-
-
 def check_non_blocking_in_comb(always_block):
     """Check for non-blocking assignments in always @(*) blocks."""
-    errors = []
-    for line in always_block.splitlines():
-        if '<=' in line:  # Non-blocking assignment
-            errors.append(line.strip())
-    return errors
+    return [m.group(1).strip() for m in _NONBLOCK_RE.finditer(always_block)]
 
 
 def check_blocking_in_seq(always_block):
-    """Check for blocking assignments in always @(posedge) blocks."""
-    errors = []
-    for line in always_block.splitlines():
-        if '=' in line and '<=' not in line:  # Blocking assignment
-            errors.append(line.strip())
-    return errors
-
+    """Check for blocking assignments in always @(posedge) blocks.
 
-def find_assigned_variables(always_block):
-    """Find all variables assigned in an always block."""
-    return set(re.findall(r'(\b\w+\b)\s*(?:<=|=)', always_block))
-
-
-def find_declared_regs(file_content):
-    """Find all variables declared as reg."""
-    return set(re.findall(r'\breg\b\s+([\w\[\]:]+)', file_content))
+    Comparisons (==, !=, <=, >=) are not counted as assignments.
+    """
+    return [m.group(1).strip() for m in _BLOCK_RE.finditer(always_block)]
 
 
 def match_begin_end(always_block):
     """Check if begin and end are properly matched in an always block."""
-    begin_count = always_block.count('begin')
-    end_count = always_block.count('end')
-    return begin_count == end_count
+    counts = Counter(m.group(1) for m in _WORD_BE.finditer(always_block))
+    return counts['begin'] == counts['end']
 
 
-def analyze_always_blocks(file_content):
+def analyze_always_blocks(scan):
     """Analyze always blocks for correctness."""
-    comb_pattern = r'always\s*@\(\*\)\s*(begin.*?end|[^;]*;)'
-    seq_pattern = r'always\s*@\(posedge.*?\)\s*(begin.*?end|[^;]*;)'
-
-    comb_blocks = find_blocks(file_content, comb_pattern)
-    seq_blocks = find_blocks(file_content, seq_pattern)
-
-    declared_regs = find_declared_regs(file_content)
+    comb_blocks = scan.comb_blocks
+    seq_blocks = scan.seq_blocks
+    declared_regs = scan.declared_regs
 
     comb_errors = 0
     seq_errors = 0
@@ -80,37 +299,35 @@ def analyze_always_blocks(file_content):
     begin_end_errors = 0
 
     for i, block in enumerate(comb_blocks, 1):
-        if 'begin' in block and not match_begin_end(block):
+        if 'begin' in block.text and not match_begin_end(block.text):
             print(f"Error: Mismatched begin-end in always @(*) block #{i}.")
             begin_end_errors += 1
 
-        errors = check_non_blocking_in_comb(block)
+        errors = check_non_blocking_in_comb(block.text)
         if errors:
             print(f"Error: Non-blocking assignment(s) found in always @(*) block #{i}:")
             for err in errors:
                 print(f"  - {err}")
             comb_errors += len(errors)
 
-        assigned_vars = find_assigned_variables(block)
-        undefined_vars = assigned_vars - declared_regs
+        undefined_vars = {name for name in block.assigned if name not in declared_regs}
         if undefined_vars:
             print(f"Error: Variables assigned in always @(*) block #{i} are not declared as reg: {undefined_vars}")
             reg_errors += len(undefined_vars)
 
     for i, block in enumerate(seq_blocks, 1):
-        if 'begin' in block and not match_begin_end(block):
+        if 'begin' in block.text and not match_begin_end(block.text):
             print(f"Error: Mismatched begin-end in always @(posedge) block #{i}.")
             begin_end_errors += 1
 
-        errors = check_blocking_in_seq(block)
+        errors = check_blocking_in_seq(block.text)
         if errors:
             print(f"Error: Blocking assignment(s) found in always @(posedge) block #{i}:")
             for err in errors:
                 print(f"  - {err}")
             seq_errors += len(errors)
 
-        assigned_vars = find_assigned_variables(block)
-        undefined_vars = assigned_vars - declared_regs
+        undefined_vars = {name for name in block.assigned if name not in declared_regs}
         if undefined_vars:
             print(f"Error: Variables assigned in always @(posedge) block #{i} are not declared as reg: {undefined_vars}")
             reg_errors += len(undefined_vars)
@@ -124,10 +341,10 @@ def analyze_always_blocks(file_content):
     print(f"  - Mismatched begin-end errors: {begin_end_errors}")
 
 
-def check_module_endmodule(file_content):
+def check_module_endmodule(scan):
     """Check if module and endmodule are properly matched."""
-    module_count = len(re.findall(r'\bmodule\b', file_content))
-    endmodule_count = len(re.findall(r'\bendmodule\b', file_content))
+    module_count = scan.module_count
+    endmodule_count = scan.endmodule_count
     
     if module_count != endmodule_count:
         print(f"Error: Mismatched module and endmodule statements.")
@@ -137,17 +354,24 @@ def check_module_endmodule(file_content):
         print("Info: module and endmodule statements are properly matched.")
 
 
-def run_verilog_syntax_check(filename):
-    """Run syntax checks on the given Verilog file."""
-    try:
-        with open(filename, 'r', encoding='utf-8') as file:
-            file_content = file.read()
+def run_verilog_syntax_check(filename, use_cache=False):
+    """Run syntax checks on the given Verilog file.
 
+    With use_cache=True the scan is kept in a small LRU cache, so checking an
+    unchanged file again (e.g. in an edit-check loop) skips rescanning it.
+    """
+    try:
+        stat = os.stat(filename)
         print(f"Checking Verilog syntax for {filename}...\n")
+        if use_cache:
+            scan = _scan_file(os.path.realpath(filename), stat.st_mtime_ns, stat.st_size)
+        else:
+            with open(filename, 'r', encoding='utf-8') as file:
+                scan = scan_verilog(read_chunks(file))
 
-        check_port_usage(file_content)
-        check_module_endmodule(file_content)
-        analyze_always_blocks(file_content)
+        check_port_usage(scan)
+        check_module_endmodule(scan)
+        analyze_always_blocks(scan)
 
         print("\nSyntax check completed.")
     except FileNotFoundError:
@@ -158,10 +382,28 @@ def run_verilog_syntax_check(filename):
         print(f"An error occurred: {e}")
 
 
-if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: python verilog_syntax_checker.py <verilog_file>")
-        sys.exit(1)
+def check_to_string(filename):
+    """Run the syntax check on a file and return its report instead of printing it."""
+    buffer = io.StringIO()
+    with contextlib.redirect_stdout(buffer):
+        run_verilog_syntax_check(filename)
+    return buffer.getvalue()
+
 
-    verilog_file = sys.argv[1]
-    run_verilog_syntax_check(verilog_file)
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run syntax checks on Verilog files.")
+    parser.add_argument("files", nargs="+", metavar="verilog_file")
+    parser.add_argument("-j", "--jobs", type=int, default=1,
+                        help="number of files to check in parallel (default: 1)")
+    args = parser.parse_args()
+    if args.jobs < 1:
+        parser.error(f"argument -j/--jobs: must be at least 1, got {args.jobs}")
+
+    if args.jobs > 1 and len(args.files) > 1:
+        # Reports are collected per file so output from workers does not interleave
+        with multiprocessing.Pool(args.jobs) as pool:
+            for report in pool.imap(check_to_string, args.files):
+                print(report, end='')
+    else:
+        for verilog_file in args.files:
+            run_verilog_syntax_check(verilog_file)